@@ -4,33 +4,40 @@
 from datetime import timedelta
 import json
 
-from PyQt5.QtCore import Qt, QAbstractTableModel, QVariant, QObject, pyqtSignal, \
+from PyQt5.QtCore import Qt, QAbstractTableModel, QObject, pyqtSignal, \
     QModelIndex
 
+try:
+    import ijson
+    # ijson's pure Python parser is much slower than json.load, so only
+    # stream timestamp files when the C backend is available
+    ijson_backend = ijson.get_backend("yajl2_c")
+    JSON_ERRORS = (ValueError, ijson.JSONError)
+except ImportError:
+    ijson_backend = None
+    JSON_ERRORS = (ValueError,)
+
 
 class TimestampDelta(timedelta):
+    # Without this, the subclass would give every instance a __dict__
+    __slots__ = ()
+
     def __new__(cls, *args, **kwargs):
         return super(TimestampDelta, cls).__new__(cls, *args, **kwargs)
 
     def __str__(self):
-        if self.milliseconds == 0:
+        total_ms = self.milliseconds
+        if total_ms == 0:
             return ""
-        mm, ss = divmod(self.seconds, 60)
-        hh, mm = divmod(mm, 60)
-        if self.days:
-            hh += self.days * 24
-        ms, _ = divmod(self.microseconds, 1000)
-        s = "%d:%02d:%02d.%03d" % (hh, mm, ss, ms)
-        return s
+        hh, rem = divmod(total_ms, 3600000)
+        mm, rem = divmod(rem, 60000)
+        ss, ms = divmod(rem, 1000)
+        return f"{hh}:{mm:02d}:{ss:02d}.{ms:03d}"
 
     @property
     def milliseconds(self):
-        ms = self.seconds * 1000000
-        if self.microseconds:
-            ms += self.microseconds
-        if self.days:
-            ms += self.days * 24 * 60 * 60 * 100000
-        return int(ms/1000)
+        return (self.days * 86400000 + self.seconds * 1000 +
+                self.microseconds // 1000)
 
     @staticmethod
     def from_string(time_string):
@@ -59,25 +66,35 @@ class TimestampDelta(timedelta):
 
 
 class Timestamp():
+    __slots__ = ('start_time', 'end_time', 'description', '_vals', '_strs')
+
     def __init__(self, start_time, end_time, description=None):
         self.start_time = TimestampDelta.from_string(start_time)
         self.end_time = TimestampDelta.from_string(end_time)
         self.description = description
+        self._update_cache()
+
+    def _update_cache(self):
+        """
+        Precompute the millisecond and string forms of the values. Must be
+        called whenever any of the values changes
+        """
+        self._vals = (self.start_time.milliseconds,
+                      self.end_time.milliseconds, self.description)
+        self._strs = (str(self.start_time), str(self.end_time),
+                      self.description or "")
 
     def get_displayed_start_time(self):
-        return str(self.start_time)
+        return self._strs[0]
 
     def get_displayed_end_time(self):
-        return str(self.end_time)
+        return self._strs[1]
 
     def get_string_value_from_index(self, index):
-        return str(self.start_time) if index == 0 else str(self.end_time) \
-            if index == 1 else self.description
+        return self._strs[index]
 
     def get_value_from_index(self, index):
-        return self.start_time.milliseconds if index == 0 \
-            else self.end_time.milliseconds if index == 1 \
-            else self.description
+        return self._vals[index]
 
     def set_value_from_index(self, index, value):
         if index == 0:
@@ -86,6 +103,7 @@ class Timestamp():
             self.end_time = value
         elif index == 2:
             self.description = value
+        self._update_cache()
 
     def __repr__(self):
         return json.dumps({
@@ -102,6 +120,8 @@ class TimestampList():
         "Description"
     ]
 
+    __slots__ = ('list',)
+
     def __init__(self, data=[]):
         self.list = []
         for timestamp in data:
@@ -129,9 +149,7 @@ class TimestampList():
     def remove_row(self, row):
         self.list.pop(row)
 
-    @staticmethod
-    def header_at_index(index):
-        return TimestampList.HEADERS[index]
+    header_at_index = staticmethod(HEADERS.__getitem__)
 
     def to_json(self):
         return '[{}]'.format(
@@ -156,12 +174,50 @@ class TimestampModel(QAbstractTableModel):
 
     def __init__(self, input_file_location=None, parent=None):
         super(TimestampModel, self).__init__(parent)
-        self.input_file_location = input_file_location
+        self.input_file_location = None
         self.list = TimestampList()
 
         if input_file_location:
-            with open(self.input_file_location, "r+") as input_file:
-                self.list = TimestampList(json.load(input_file))
+            self.load(input_file_location)
+
+    def load(self, input_file_location):
+        """
+        Replace the current entries with the ones from another timestamp file,
+        resetting the model in place so attached views keep their wiring
+        :param input_file_location: The timestamp file to read
+        :return: None
+        """
+        timestamps = TimestampList()
+        with open(input_file_location, "rb", buffering=65536) as input_file:
+            append = timestamps.append
+            try:
+                # A timestamp file must hold an array; anything else would
+                # load as empty and be overwritten on the next edit
+                if ijson_backend is not None:
+                    # Stream the entries straight into Timestamps rather than
+                    # loading the whole JSON array into dicts first
+                    events = ijson_backend.parse(input_file)
+                    _, event, _ = next(events, (None, None, None))
+                    if event != "start_array":
+                        raise ValueError("Timestamp file is not a JSON array")
+                    entries = ijson_backend.items(events, "item")
+                else:
+                    entries = json.load(input_file)
+                    if not isinstance(entries, list):
+                        raise ValueError("Timestamp file is not a JSON array")
+                for timestamp in entries:
+                    append(Timestamp(timestamp['start_time'],
+                                     timestamp['end_time'],
+                                     timestamp.get('description')))
+            except JSON_ERRORS + (KeyError, TypeError, IndexError,
+                                  AttributeError) as err:
+                # Callers expect a ValueError for malformed files or entries
+                raise ValueError(str(err)) from err
+
+        self.beginResetModel()
+        self.input_file_location = input_file_location
+        self.list = timestamps
+        self.endResetModel()
 
     def rowCount(self, parent=None, *args, **kwargs):
         if parent and parent.isValid():
@@ -173,20 +229,24 @@ class TimestampModel(QAbstractTableModel):
             return 0
         return 3
 
-    def data(self, index, role=None):
+    # Called for every cell on every paint, hence the Qt constants bound as
+    # default arguments and the early return for unused roles
+    def data(self, index, role=None, _user=Qt.UserRole, _disp=Qt.DisplayRole,
+             _edit=Qt.EditRole):
+        if role != _disp and role != _edit and role != _user:
+            return None
         if not index.isValid():
-            return QVariant()
-        if role == Qt.UserRole:
+            return None
+        if role == _user:
             return self.list[index.row()].get_value_from_index(index.column())
-        if role != Qt.DisplayRole and role != Qt.EditRole:
-            return QVariant()
         return self.list[index.row()].get_string_value_from_index(
             index.column())
 
-    def headerData(self, col, orientation, role=None):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+    def headerData(self, col, orientation, role=None, _horiz=Qt.Horizontal,
+                   _disp=Qt.DisplayRole):
+        if orientation == _horiz and role == _disp:
             return self.list.header_at_index(col)
-        return QVariant()
+        return None
 
     def flags(self, index):
         if not index.isValid():
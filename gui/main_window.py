@@ -6,51 +6,88 @@ import sys
 import traceback
 
 import qtawesome as qta
-from PyQt5 import uic
 from PyQt5.QtWidgets import QApplication, QFileDialog, QMainWindow, \
     QMessageBox, QDataWidgetMapper
 from PyQt5.QtGui import QCursor
-from PyQt5.QtCore import QDir, QTimer, Qt, QModelIndex, QSortFilterProxyModel
+from PyQt5.QtCore import QDir, Qt, QModelIndex, QSortFilterProxyModel, \
+    pyqtSignal
 
 from lib import vlc
 from app.model import TimestampModel, ToggleButtonModel, TimestampDelta
+# Generated from main_window.ui, regenerate after editing the .ui file with:
+#   pyuic5 gui/main_window.ui -o gui/ui_main_window.py
+from gui.ui_main_window import Ui_window
+
+# Extensions tried first when looking for the video next to a timestamp file
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".avi", ".mov", ".webm", ".m4v", ".wmv",
+                    ".flv")
 
 
 class MainWindow(QMainWindow):
     """
     The main window class
     """
+    # These are emitted from VLC's event thread and must only be connected
+    # with Qt.QueuedConnection, so their slots run in the GUI thread
+    positionChanged = pyqtSignal(float)
+    restartNeeded = pyqtSignal()
+    mediaEnded = pyqtSignal()
+
     def __init__(self, parent=None):
         QMainWindow.__init__(self, parent)
-        self.ui = uic.loadUi("gui/main_window.ui")
+        self.ui = Ui_window()
+        self.ui.setupUi(self)
 
         self.timestamp_filename = None
         self.video_filename = None
         self.media_start_time = None
         self.media_end_time = None
+        # Duration of the loaded media and the factor converting a time in
+        # it to a position on the progress slider, set in set_video_filename
+        self._duration_ms = None
+        self._ms_to_slider = None
         self.restart_needed = False
-        self.timer_period = 100
         self.is_full_screen = False
         self.media_started_playing = False
         self.media_is_playing = False
         self.original_geometry = None
         self.mute = False
+        self._vlc_instance = None
+        self._media_player = None
 
+        # The models live as long as the window; opening another timestamp
+        # file only resets their content
         self.timestamp_model = TimestampModel(None, self)
+        self.timestamp_model.timeParseError.connect(
+            lambda err: self._show_error(err)
+        )
         self.proxy_model = QSortFilterProxyModel(self)
-        self.ui.list_timestamp.setModel(self.timestamp_model)
+        self.proxy_model.setSortRole(Qt.UserRole)
+        self.proxy_model.setSourceModel(self.timestamp_model)
+        # The view resizes changed and inserted rows from these signals, so it
+        # has to be connected before the slots below re-sort the rows
+        self.ui.list_timestamp.setModel(self.proxy_model)
+        self.proxy_model.dataChanged.connect(self._sort_model)
+        self.proxy_model.dataChanged.connect(self.update_slider_highlight)
+        self.proxy_model.rowsInserted.connect(self._sort_model)
+        self.proxy_model.rowsInserted.connect(self._select_blank_row)
+        self.ui.list_timestamp.selectionModel().selectionChanged.connect(
+            self.timestamp_selection_changed)
+        # Resetting the model doesn't notify the selection model, so clear the
+        # selection just before a reset to have the detail editor emptied.
+        # load() only resets once the new file has been parsed successfully
+        self.timestamp_model.modelAboutToBeReset.connect(
+            self.ui.list_timestamp.clearSelection)
         self.ui.list_timestamp.doubleClicked.connect(
             lambda event: self.ui.list_timestamp.indexAt(event.pos()).isValid()
             and self.run()
         )
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_ui)
-        self.timer.timeout.connect(self.timer_handler)
-        self.timer.start(self.timer_period)
+        self.positionChanged.connect(self.update_ui, Qt.QueuedConnection)
+        self.restartNeeded.connect(self.timer_handler, Qt.QueuedConnection)
+        self.mediaEnded.connect(self.media_end_handler, Qt.QueuedConnection)
 
-        self.vlc_instance = vlc.Instance()
-        self.media_player = self.vlc_instance.media_player_new()
+        # vlc_instance and media_player are created on first use, see below
         # if sys.platform == "darwin":  # for MacOS
         #     self.ui.frame_video = QMacCocoaViewContainer(0)
 
@@ -96,16 +133,29 @@ class MainWindow(QMainWindow):
         self.ui.btnLeft.clicked.connect(self.seek_left_handler)
         self.ui.btnRight.clicked.connect(self.seek_right_handler)
 
+        # Build the icons once; toggling a button only swaps between these
+        self._icon_play = qta.icon("fa.play", scale_factor=0.7)
+        self._icon_pause = qta.icon("fa.pause", scale_factor=0.7)
+        self._icon_volume_on = qta.icon("fa.volume-up", scale_factor=0.8)
+        self._icon_volume_off = qta.icon("fa.volume-off", scale_factor=0.8)
+        self._icon_fullscreen = qta.icon("ei.fullscreen", scale_factor=0.6)
+        self._icon_speed_up = qta.icon("fa.arrow-circle-o-up",
+                                       scale_factor=0.8)
+        self._icon_slow_down = qta.icon("fa.arrow-circle-o-down",
+                                        scale_factor=0.8)
+        self._icon_mark_start = qta.icon("fa.quote-left", scale_factor=0.7)
+        self._icon_mark_end = qta.icon("fa.quote-right", scale_factor=0.7)
+
         self.play_pause_model = ToggleButtonModel(None, self)
         self.play_pause_model.setStateMap(
             {
                 True: {
                     "text": "",
-                    "icon": qta.icon("fa.play", scale_factor=0.7)
+                    "icon": self._icon_play
                 },
                 False: {
                     "text": "",
-                    "icon": qta.icon("fa.pause", scale_factor=0.7)
+                    "icon": self._icon_pause
                 }
             }
         )
@@ -117,52 +167,40 @@ class MainWindow(QMainWindow):
             {
                 True: {
                     "text": "",
-                    "icon": qta.icon("fa.volume-up", scale_factor=0.8)
+                    "icon": self._icon_volume_on
                 },
                 False: {
                     "text": "",
-                    "icon": qta.icon("fa.volume-off", scale_factor=0.8)
+                    "icon": self._icon_volume_off
                 }
             }
         )
         self.ui.button_mute_toggle.setModel(self.mute_model)
         self.ui.button_mute_toggle.clicked.connect(self.toggle_mute)
 
-        self.ui.button_full_screen.setIcon(
-            qta.icon("ei.fullscreen", scale_factor=0.6)
-        )
+        self.ui.button_full_screen.setIcon(self._icon_fullscreen)
         self.ui.button_full_screen.setText("")
         self.ui.button_full_screen.clicked.connect(self.toggle_full_screen)
         self.ui.button_speed_up.clicked.connect(self.speed_up_handler)
-        self.ui.button_speed_up.setIcon(
-            qta.icon("fa.arrow-circle-o-up", scale_factor=0.8)
-        )
+        self.ui.button_speed_up.setIcon(self._icon_speed_up)
         self.ui.button_speed_up.setText("")
         self.ui.button_slow_down.clicked.connect(self.slow_down_handler)
-        self.ui.button_slow_down.setIcon(
-            qta.icon("fa.arrow-circle-o-down", scale_factor=0.8)
-        )
+        self.ui.button_slow_down.setIcon(self._icon_slow_down)
         self.ui.button_slow_down.setText("")
-        self.ui.button_mark_start.setIcon(
-            qta.icon("fa.quote-left", scale_factor=0.7)
-        )
+        self.ui.button_mark_start.setIcon(self._icon_mark_start)
         self.ui.button_mark_start.setText("")
-        self.ui.button_mark_end.setIcon(
-            qta.icon("fa.quote-right", scale_factor=0.7)
-        )
+        self.ui.button_mark_end.setIcon(self._icon_mark_end)
         self.ui.button_mark_end.setText("")
         self.ui.button_add_entry.clicked.connect(self.add_entry)
         self.ui.button_remove_entry.clicked.connect(self.remove_entry)
 
         self.ui.button_mark_start.clicked.connect(
             lambda: self.set_mark(start_time=int(
-                self.media_player.get_position() *
-                self.media_player.get_media().get_duration()))
+                self.media_player.get_position() * self._duration_ms))
         )
         self.ui.button_mark_end.clicked.connect(
             lambda: self.set_mark(end_time=int(
-                self.media_player.get_position() *
-                self.media_player.get_media().get_duration()))
+                self.media_player.get_position() * self._duration_ms))
         )
 
         self.ui.slider_progress.setTracking(False)
@@ -173,22 +211,51 @@ class MainWindow(QMainWindow):
         # Mapper between the table and the entry detail
         self.mapper = QDataWidgetMapper()
         self.mapper.setSubmitPolicy(QDataWidgetMapper.ManualSubmit)
+        self.mapper.setModel(self.proxy_model)
+        self.mapper.addMapping(self.ui.entry_start_time, 0)
+        self.mapper.addMapping(self.ui.entry_end_time, 1)
+        self.mapper.addMapping(self.ui.entry_description, 2)
         self.ui.button_save.clicked.connect(self.mapper.submit)
 
+        self.show()
+
+    @property
+    def vlc_instance(self):
+        """
+        The VLC instance. Starting VLC is slow, so this is only done the first
+        time it's needed rather than at startup
+        """
+        if self._vlc_instance is None:
+            self._vlc_instance = vlc.Instance()
+        return self._vlc_instance
+
+    @property
+    def media_player(self):
+        """
+        The VLC media player, set up on first use
+        """
+        if self._media_player is None:
+            self._media_player = self._create_media_player()
+        return self._media_player
+
+    def _create_media_player(self):
+        media_player = self.vlc_instance.media_player_new()
+
         # Set up default volume
-        self.set_volume(self.ui.slider_volume.value())
+        media_player.audio_set_volume(self.ui.slider_volume.value())
 
-        self.vlc_events = self.media_player.event_manager()
+        self.vlc_events = media_player.event_manager()
         self.vlc_events.event_attach(
             vlc.EventType.MediaPlayerTimeChanged, self.media_time_change_handler
         )
+        self.vlc_events.event_attach(
+            vlc.EventType.MediaPlayerEndReached, self.media_end_reached_handler
+        )
 
         # Let our application handle mouse and key input instead of VLC
-        self.media_player.video_set_mouse_input(False)
-        self.media_player.video_set_key_input(False)
-
-        self.ui.show()
-
+        media_player.video_set_mouse_input(False)
+        media_player.video_set_key_input(False)
+        return media_player
 
     def add_entry(self):
         if not self.timestamp_filename:
@@ -212,8 +279,7 @@ class MainWindow(QMainWindow):
     def set_media_position(self, position):
         percentage = position / 10000.0
         self.media_player.set_position(percentage)
-        absolute_position = percentage * \
-            self.media_player.get_media().get_duration()
+        absolute_position = percentage * self._duration_ms
         if absolute_position > self.media_end_time:
             self.media_end_time = -1
 
@@ -235,19 +301,23 @@ class MainWindow(QMainWindow):
                                      TimestampDelta.string_from_int(
                                          end_time))
 
-    def update_ui(self):
-        self.ui.slider_progress.blockSignals(True)
-        self.ui.slider_progress.setValue(
-            self.media_player.get_position() * 10000
-        )
-        #print(self.media_player.get_position() * 10000)
+    def update_ui(self, position):
+        slider_value = int(position * 10000)
+        slider = self.ui.slider_progress
+        # Most time changes don't move the slider by a whole step, so skip
+        # the signal blocking and repaint when the value is the same
+        if slider_value != slider.value():
+            slider.blockSignals(True)
+            slider.setValue(slider_value)
+            slider.blockSignals(False)
 
         self.update_video_file_play_labels()
 
-        # When the video finishes
-        self.ui.slider_progress.blockSignals(False)
-        if self.media_started_playing and \
-           self.media_player.get_media().get_state() == vlc.State.Ended:
+    def media_end_handler(self):
+        """
+        Called (in the GUI thread) when the video finishes
+        """
+        if self.media_started_playing:
             self.play_pause_model.setState(True)
             # Apparently we need to reset the media, otherwise the player
             # won't play at all
@@ -261,11 +331,12 @@ class MainWindow(QMainWindow):
         """
         This is a workaround, because for some reason we can't call set_time()
         inside the MediaPlayerTimeChanged handler (as the video just stops
-        playing)
+        playing). The handler emits restartNeeded instead, which is queued to
+        run this in the GUI thread
         """
-        if self.restart_needed:
+        if self.restart_needed and self.media_started_playing:
             self.media_player.set_time(self.media_start_time)
-            self.restart_needed = False
+        self.restart_needed = False
 
     def key_handler(self, event):
         if event.key() == Qt.Key_Escape and self.is_full_screen:
@@ -307,41 +378,45 @@ class MainWindow(QMainWindow):
             return
         self.media_player.set_rate(new_rate)
 
-    def media_time_change_handler(self, _):
-        if self.media_end_time == -1:
+    def media_time_change_handler(self, event):
+        # The event carries the new time, so there's no need to call back into
+        # libVLC from its event thread for the time or position
+        new_time = event.u.new_time
+        duration = self._duration_ms
+        if duration:
+            self.positionChanged.emit(new_time / duration)
+        end = self.media_end_time
+        if self.restart_needed or end is None or end <= 0:
             return
-        if self.media_player.get_time() > self.media_end_time:
+        if new_time > end:
             self.restart_needed = True
+            self.restartNeeded.emit()
+
+    def media_end_reached_handler(self, _):
+        self.mediaEnded.emit()
 
     def update_slider_highlight(self):
-        if self.ui.list_timestamp.selectionModel().hasSelection():
-            selected_row = self.ui.list_timestamp.selectionModel(). \
-                selectedRows()[0]
-            self.media_start_time = self.ui.list_timestamp.model().data(
-                selected_row.model().index(selected_row.row(), 0),
-                Qt.UserRole
-            )
-            self.media_end_time = self.ui.list_timestamp.model().data(
-                selected_row.model().index(selected_row.row(), 1),
-                Qt.UserRole
-            )
-            duration = self.media_player.get_media().get_duration()
-            self.media_end_time = self.media_end_time \
-                if self.media_end_time != 0 else duration
-            if self.media_start_time > self.media_end_time:
+        selection = self.ui.list_timestamp.selectionModel().selection()
+        if not selection.isEmpty():
+            # Read the first selected range directly instead of building the
+            # list of every selected row, and go straight to the Timestamp
+            # rather than through data()
+            source_row = self.proxy_model.mapToSource(
+                selection[0].topLeft()).row()
+            timestamp = self.timestamp_model.list[source_row]
+            duration = self._duration_ms
+            start_time = timestamp.get_value_from_index(0)
+            end_time = timestamp.get_value_from_index(1) or duration
+            self.media_start_time, self.media_end_time = start_time, end_time
+            if start_time > end_time:
                 raise ValueError("Start time cannot be later than end time")
-            if self.media_start_time > duration:
+            if start_time > duration:
                 raise ValueError("Start time not within video duration")
-            if self.media_end_time > duration:
+            if end_time > duration:
                 raise ValueError("End time not within video duration")
-            slider_start_pos = (self.media_start_time / duration) * \
-                               (self.ui.slider_progress.maximum() -
-                                self.ui.slider_progress.minimum())
-            slider_end_pos = (self.media_end_time / duration) * \
-                             (self.ui.slider_progress.maximum() -
-                              self.ui.slider_progress.minimum())
+            ms_to_slider = self._ms_to_slider
             self.ui.slider_progress.setHighlight(
-                int(slider_start_pos), int(slider_end_pos)
+                int(start_time * ms_to_slider), int(end_time * ms_to_slider)
             )
 
         else:
@@ -361,8 +436,9 @@ class MainWindow(QMainWindow):
             return
         try:
             self.update_slider_highlight()
-            self.media_player.play()
-            self.media_player.set_time(self.media_start_time)
+            media_player = self.media_player
+            media_player.play()
+            media_player.set_time(self.media_start_time)
             self.media_started_playing = True
             self.media_is_playing = True
             self.play_pause_model.setState(False)
@@ -600,43 +676,46 @@ class MainWindow(QMainWindow):
             return
 
         try:
-            self.timestamp_model = TimestampModel(filename, self)
-            self.timestamp_model.timeParseError.connect(
-                lambda err: self._show_error(err)
-            )
-            self.proxy_model.setSortRole(Qt.UserRole)
-            self.proxy_model.dataChanged.connect(self._sort_model)
-            self.proxy_model.dataChanged.connect(self.update_slider_highlight)
-            self.proxy_model.setSourceModel(self.timestamp_model)
-            self.proxy_model.rowsInserted.connect(self._sort_model)
-            self.proxy_model.rowsInserted.connect(self._select_blank_row)
-            self.ui.list_timestamp.setModel(self.proxy_model)
+            self.timestamp_model.load(filename)
 
             self.timestamp_filename = filename
             self.ui.entry_timestamp.setText(self.timestamp_filename)
-
-            self.mapper.setModel(self.proxy_model)
-            self.mapper.addMapping(self.ui.entry_start_time, 0)
-            self.mapper.addMapping(self.ui.entry_end_time, 1)
-            self.mapper.addMapping(self.ui.entry_description, 2)
-            self.ui.list_timestamp.selectionModel().selectionChanged.connect(
-                self.timestamp_selection_changed)
             self._sort_model()
 
-            directory = os.path.dirname(self.timestamp_filename)
-            basename = os.path.basename(self.timestamp_filename)
-            timestamp_name_without_ext = os.path.splitext(basename)[0]
-            for file_in_dir in os.listdir(directory):
-                current_filename = os.path.splitext(file_in_dir)[0]
-                found_video = (current_filename == timestamp_name_without_ext
-                               and file_in_dir != basename)
-                if found_video:
-                    found_video_file = os.path.join(directory, file_in_dir)
-                    self.set_video_filename(found_video_file)
-                    break
+            found_video_file = self._find_video_for_timestamp_file(
+                self.timestamp_filename)
+            if found_video_file:
+                self.set_video_filename(found_video_file)
         except ValueError as err:
             self._show_error("Timestamp file is invalid")
 
+    @staticmethod
+    def _find_video_for_timestamp_file(timestamp_filename):
+        """
+        Look for a file next to the timestamp file that has the same name but
+        a different extension
+        :param timestamp_filename: The timestamp file
+        :return: The path of the video file, or None if there isn't one
+        """
+        directory = os.path.dirname(timestamp_filename)
+        basename = os.path.basename(timestamp_filename)
+        timestamp_name_without_ext = os.path.splitext(basename)[0]
+        # Probe the common extensions directly before falling back to a
+        # directory listing, which is slow on large or network directories
+        for ext in VIDEO_EXTENSIONS:
+            candidate = os.path.join(directory,
+                                     timestamp_name_without_ext + ext)
+            if candidate != timestamp_filename and os.path.isfile(candidate):
+                return candidate
+        with os.scandir(directory or os.curdir) as entries:
+            for entry in entries:
+                name = entry.name
+                base, dot, _ = name.rpartition(".")
+                if dot and base == timestamp_name_without_ext and \
+                   name != basename and entry.is_file():
+                    return entry.path
+        return None
+
     def timestamp_selection_changed(self, selected, deselected):
         if len(selected) > 0:
             self.mapper.setCurrentModelIndex(selected.indexes()[0])
@@ -668,11 +747,17 @@ class MainWindow(QMainWindow):
 
         media = self.vlc_instance.media_new(self.video_filename)
         media.parse()
-        if not media.get_duration():
+        self._duration_ms = media.get_duration()
+        if not self._duration_ms:
             self._show_error("Cannot play this media file")
             self.media_player.set_media(None)
             self.video_filename = None
+            self._duration_ms = None
+            self._ms_to_slider = None
         else:
+            self._ms_to_slider = (self.ui.slider_progress.maximum() -
+                                  self.ui.slider_progress.minimum()) / \
+                self._duration_ms
             self.media_player.set_media(media)
             if sys.platform.startswith('linux'): # for Linux using the X Server
                 self.media_player.set_xwindow(self.ui.frame_video.winId())
@@ -11,7 +11,33 @@ class TimestampTableView(QTableView):
 
     def __init__(self, parent=None):
         super(TimestampTableView, self).__init__(parent)
-        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        # ResizeToContents would query every row's size hint on each paint,
+        # so rows have a fixed height and are only measured when their content
+        # changes
+        header = self.verticalHeader()
+        header.setSectionResizeMode(QHeaderView.Fixed)
+        header.setDefaultSectionSize(self.fontMetrics().lineSpacing() + 8)
+
+    def setModel(self, model):
+        old_model = self.model()
+        if old_model is not None:
+            old_model.modelReset.disconnect(self.resizeRowsToContents)
+            old_model.rowsInserted.disconnect(self._resizeRows)
+            old_model.dataChanged.disconnect(self._resizeChangedRows)
+        super(TimestampTableView, self).setModel(model)
+        # QHeaderView keeps section sizes with their rows when the layout
+        # changes (e.g. on sorting), so that doesn't need a re-measure
+        if model is not None:
+            model.modelReset.connect(self.resizeRowsToContents)
+            model.rowsInserted.connect(self._resizeRows)
+            model.dataChanged.connect(self._resizeChangedRows)
+
+    def _resizeRows(self, _, first, last):
+        for row in range(first, last + 1):
+            self.resizeRowToContents(row)
+
+    def _resizeChangedRows(self, topLeft, bottomRight, *_):
+        self._resizeRows(None, topLeft.row(), bottomRight.row())
 
     def mouseReleaseEvent(self, event):
         super(TimestampTableView, self).mouseReleaseEvent(event)
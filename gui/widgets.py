@@ -45,6 +45,11 @@ class HighlightedJumpSlider(QSlider):
         super(HighlightedJumpSlider, self).__init__(parent)
         self.highlightStart = None
         self.highlightEnd = None
+        self._highlightBrush = QColor(0, 152, 116)
+        self._highlightPen = QPen(QColor(0, 152, 116, int(0.3 * 255)), 1.0)
+        # Geometry of the highlight, only recomputed when it's invalidated
+        self._highlightRect = None
+        self.rangeChanged.connect(self._invalidateHighlight)
 
     def mousePressEvent(self, ev):
         """ Jump to click position """
@@ -61,31 +66,38 @@ class HighlightedJumpSlider(QSlider):
     def setHighlight(self, start, end):
         if start is not None and end is not None and start < end:
             self.highlightStart, self.highlightEnd = start, end
+            self._invalidateHighlight()
+
+    def _invalidateHighlight(self, *_):
+        self._highlightRect = None
+
+    def _computeHighlightRect(self):
+        opt = QStyleOptionSlider()
+        self.initStyleOption(opt)
+        gr = self.style().subControlRect(QStyle.CC_Slider, opt,
+                                         QStyle.SC_SliderGroove, self)
+        rectX, rectY, rectW, rectH = gr.getRect()
+        pxPerUnit = rectW / (self.maximum() - self.minimum())
+        startX = int(pxPerUnit * self.highlightStart + rectX)
+        startY = (rectH - rectY) // 2
+        width = int(pxPerUnit * self.highlightEnd + rectX) - startX
+        height = (rectH - startY) // 2
+        return QRect(startX, startY, width, height)
+
+    def resizeEvent(self, event):
+        self._invalidateHighlight()
+        super(HighlightedJumpSlider, self).resizeEvent(event)
 
     def paintEvent(self, event):
-        if self.highlightStart is not None and self.highlightEnd is not None:
-            p = QPainter(self)
-            opt = QStyleOptionSlider()
-            self.initStyleOption(opt)
-            gr = self.style().subControlRect(QStyle.CC_Slider, opt,
-                                             QStyle.SC_SliderGroove, self)
-            rectX, rectY, rectW, rectH = gr.getRect()
-            startX = int(
-                (rectW/(self.maximum() - self.minimum()))
-                * self.highlightStart + rectX
-            )
-            startY = (rectH - rectY) / 2
-            width = int(
-                (rectW/(self.maximum() - self.minimum()))
-                * self.highlightEnd + rectX
-            ) - startX
-            height = (rectH - startY) / 2
-            c = QColor(0, 152, 116)
-            p.setBrush(c)
-            c.setAlphaF(0.3)
-            p.setPen(QPen(c, 1.0))
-            rectToPaint = QRect(startX, startY, width, height)
-            p.drawRects(rectToPaint)
+        if self.highlightStart is None or self.highlightEnd is None:
+            return super(HighlightedJumpSlider, self).paintEvent(event)
+        if self._highlightRect is None:
+            self._highlightRect = self._computeHighlightRect()
+        p = QPainter(self)
+        p.setBrush(self._highlightBrush)
+        p.setPen(self._highlightPen)
+        p.drawRect(self._highlightRect)
+        p.end()
         super(HighlightedJumpSlider, self).paintEvent(event)
 
 
@@ -94,22 +106,32 @@ class PlainTextEdit(QPlainTextEdit):
     For some reason Qt refuses to style readOnly QPlainTextEdit correctly, so
     this class is a workaround for that
     """
+    READ_ONLY_STYLE_SHEET = ("QPlainTextEdit {"
+                             "background-color: #F0F0F0;"
+                             "color: #808080;"
+                             "border: 1px solid #B0B0B0;"
+                             "border-radius: 2px;"
+                             "}")
+    EDITABLE_STYLE_SHEET = ("QPlainTextEdit {"
+                            "background-color: #FFFFFF;"
+                            "color: #000000;"
+                            "border: 1px solid #B0B0B0;"
+                            "border-radius: 2px;"
+                            "}")
+
+    def __init__(self, parent=None):
+        super(PlainTextEdit, self).__init__(parent)
+        self._currentStyleSheet = None
+
     def setReadOnly(self, readOnly):
         super(PlainTextEdit, self).setReadOnly(readOnly)
-        if readOnly:
-            self.setStyleSheet("QPlainTextEdit {"
-                               "background-color: #F0F0F0;"
-                               "color: #808080;"
-                               "border: 1px solid #B0B0B0;"
-                               "border-radius: 2px;"
-                               "}")
-        elif not readOnly:
-            self.setStyleSheet("QPlainTextEdit {"
-                               "background-color: #FFFFFF;"
-                               "color: #000000;"
-                               "border: 1px solid #B0B0B0;"
-                               "border-radius: 2px;"
-                               "}")
+        styleSheet = self.READ_ONLY_STYLE_SHEET if readOnly \
+            else self.EDITABLE_STYLE_SHEET
+        # Setting a style sheet makes Qt re-parse and re-apply it, so skip it
+        # when the state doesn't change
+        if styleSheet is not self._currentStyleSheet:
+            self.setStyleSheet(styleSheet)
+            self._currentStyleSheet = styleSheet
 
 
 class ToggleButton(QPushButton):
@@ -1,4 +1,6 @@
 # -*- mode: python -*-
+# Build with Python 3.6 or newer, and point the fontawesome path below at
+# that installation
 
 block_cipher = None
 
@@ -24,7 +26,6 @@ exe = EXE(pyz,
 coll = COLLECT(exe,
                a.binaries,
                [('gui/application.qss', 'gui/application.qss', 'DATA')],
-               [('gui/main_window.ui', 'gui/main_window.ui', 'DATA')],
                fontawesome,
                a.zipfiles,
                a.datas,